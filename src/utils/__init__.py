@@ -2,4 +2,6 @@
 This module is used to import all the utility functions in the project.
 """
 
-from .github_helper import github_release_search, github_variable
+from .github_helper import github_variable, github_variables_bulk
+from .github_releases import github_release_search
+from .github_secrets_async import github_variables_async
@@ -2,19 +2,64 @@
 Module to manage GitHub Action Secrets.
 """
 
-import base64
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import functools
+import logging
 import os
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 import requests
-from github import Auth, Github
 
+from .github_secrets import _get_secrets_public_key, _put_secret, _raw_delete_secret, _secrets_scope
+from .github_secrets_async import github_variables_async
+from .github_session import _get_session, _send_with_retry
+from .github_variable_args import _needs_public_key, _prepare_variable_args, _secret_scope_of
+from .github_written_values import _is_value_unchanged, _record_written_value, _save_written_values
+
+if TYPE_CHECKING:
+    from github import Github
+    from github.Organization import Organization
+    from github.Repository import Repository
+
+LOGGER = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_gh_client(api_ep: str, pat: str) -> Github:
+    """
+    Get a `Github` client for the API endpoint and token, reused across calls.
+
+    `pool_size` is passed explicitly so the client keeps a connection pool instead of opening new
+    connections for each request.
+    """
+    from github import Auth, Github  # pylint: disable=import-outside-toplevel
+
+    return Github(base_url=api_ep, auth=Auth.Token(pat), pool_size=20)
+
+
+@functools.lru_cache(maxsize=64)
+def _get_gh_repo(api_ep: str, pat: str, repository: str) -> Repository:
+    """
+    Get a repository, fetched once per process.
+    """
+    return _get_gh_client(api_ep, pat).get_repo(repository)
+
+
+@functools.lru_cache(maxsize=16)
+def _get_gh_organization(api_ep: str, pat: str, organization: str) -> Organization:
+    """
+    Get an organization, fetched once per process.
+    """
+    return _get_gh_client(api_ep, pat).get_organization(organization)
 
-# pylint: disable=too-many-arguments,too-many-locals,too-many-return-statements,too-many-branches,too-many-statements,too-many-positional-arguments
-def github_variable(
+
+def github_variable(  # pylint: disable=too-many-arguments,too-many-positional-arguments
     pat: str,
     name: str,
-    unencrypted_value: str,
+    unencrypted_value: Union[str, bytes],
     environment: Optional[str] = None,
     repository: Optional[str] = None,
     organization: Optional[str] = None,
@@ -23,6 +68,7 @@ def github_variable(
     is_secret: bool = True,
     state: str = "present",
     api_ep: str = "https://api.github.com",
+    force: bool = False,
 ) -> None:
     """
     Performs Create, Read, Update, and Delete (CRUD) operations.
@@ -30,176 +76,202 @@ def github_variable(
     This function is responsible for performing CRUD operations
     on GitHub Action Secrets based on the provided parameters.
 
+    Secrets are written with direct REST calls, fetching the scope public key once per process.
+    Set `VAULTOPS_GH_USE_PYGITHUB=true` to go through PyGithub instead. Variables always use PyGithub.
+
+    A keyed hash of every written value is kept in `~/.cache/vaultops/secret_hashes.json`, and writes of a
+    value that is unchanged since the last successful write are skipped, unless `force` is set.
+    Deleting a secret that does not exist is not an error.
+
     Parameters:
         api_ep: (str): The GitHub API endpoint. Optional.
         pat: (str): The personal access token (PAT) to authenticate with GitHub. Required.
         is_secret: (bool): Whether the value is a secret. Optional.
         environment: (str): The environment to which the secret belongs. Optional.
-        unencrypted_value: (str): The unencrypted value of the secret. Required.
+        unencrypted_value: (Union[str, bytes]): The unencrypted value of the secret. Required.
         is_base64_encoded: (bool): Whether to base64 encode the secret. Optional.
         visibility (str): The visibility of the secret. Optional.
         state (str): The state of the secret. Optional.
         repository (str): The name of the repository. Optional.
         organization (str): The organization of the repository. Optional.
         name (str): The name of the secret. Required.
+        force (bool): Whether to write the value even if it is unchanged since the last write. Optional.
 
     Returns:
         dict: A dictionary containing the results of the CRUD operation.
     """
 
-    if repository and organization:
-        raise ValueError("repository and organization are mutually exclusive")
+    args: Dict[str, Any] = {
+        "name": name,
+        "unencrypted_value": unencrypted_value,
+        "environment": environment,
+        "repository": repository,
+        "organization": organization,
+        "is_base64_encoded": is_base64_encoded,
+        "visibility": visibility,
+        "is_secret": is_secret,
+        "state": state,
+        "force": force,
+    }
+    _apply_variable(pat=pat, api_ep=api_ep, args=_prepare_variable_args(args))
+    _save_written_values()
 
-    if repository and visibility:
-        raise ValueError("repository and visibility are mutually exclusive")
 
-    if not repository and not organization:
-        raise ValueError("repository or organization is mandatory")
+def github_variables_bulk(
+    pat: str,
+    items: List[Dict[str, Any]],
+    api_ep: str = "https://api.github.com",
+    max_workers: int = 4,
+    use_asyncio: bool = False,
+) -> None:
+    """
+    Performs `github_variable` for many secrets and variables concurrently.
 
-    if organization and environment:
-        raise ValueError("organization and environment are mutually exclusive")
+    All items are validated before anything is sent, and the public key of every secret scope is
+    loaded once up front, so the workers only do the writes. Rate limited workers back off on their own.
+    If the public key of a scope cannot be fetched, only the secrets of that scope fail.
 
-    if state not in ("present", "absent"):
-        raise ValueError(f"state should be either present or absent, {state}")
+    With `use_asyncio`, the items are sent by `github_variables_async` on an event loop instead of a thread pool.
 
-    if visibility and visibility not in ["private", "all", "selected"]:
-        raise ValueError("visibility should in 'private', 'all', 'selected'")
+    Parameters:
+        pat: (str): The personal access token (PAT) to authenticate with GitHub. Required.
+        items: (List[Dict[str, Any]]): The `github_variable` keyword arguments, other than `pat` and `api_ep`,
+            for each secret or variable. Required.
+        api_ep: (str): The GitHub API endpoint. Optional.
+        max_workers: (int): The maximum number of concurrent requests. Optional. Default is 4.
+        use_asyncio: (bool): Whether to use `github_variables_async`, secrets only. Optional. Default is False.
 
-    if state == "absent" and unencrypted_value:
-        raise ValueError("unencrypted_value is not required for state absent")
+    Raises:
+        ValueError: If any item is invalid, or if any of the operations failed.
+    """
 
-    if state == "absent" and is_base64_encoded:
-        raise ValueError("is_base64_encoded is not required for state absent")
+    if use_asyncio:
+        asyncio.run(github_variables_async(pat=pat, items=items, api_ep=api_ep, limit_per_host=max_workers))
+        return
+
+    prepared_items: List[Dict[str, Any]] = [_prepare_variable_args(item) for item in items]
+
+    errors: List[str] = []
+    # Items of a scope whose public key could not be fetched fail without being sent.
+    scope_errors: Dict[Tuple[Optional[str], Optional[str], Optional[str]], Exception] = {}
+    if _use_rest_for_secrets():
+        session: requests.Session = _get_session(pat)
+        for scope in {_secret_scope_of(item) for item in prepared_items if _needs_public_key(pat, api_ep, item)}:
+            try:
+                _get_secrets_public_key(session, api_ep, *scope)
+            except (requests.RequestException, KeyError, ValueError) as e:
+                LOGGER.error("Error fetching the GitHub secrets public key of %s: %s", _secrets_scope(*scope), e)
+                scope_errors[scope] = e
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures: Dict[concurrent.futures.Future[None], str] = {}
+        for item in prepared_items:
+            if _secret_scope_of(item) in scope_errors and _needs_public_key(pat, api_ep, item):
+                errors.append(f"{item['name']}: {scope_errors[_secret_scope_of(item)]}")
+                continue
+            futures[executor.submit(_apply_variable, pat=pat, api_ep=api_ep, args=item)] = item["name"]
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:  # pylint: disable=broad-except
+                LOGGER.error("Error setting up GitHub variable %s: %s", futures[future], e)
+                errors.append(f"{futures[future]}: {e}")
+    _save_written_values()
+
+    if errors:
+        raise ValueError(f"Error setting up {len(errors)} of {len(prepared_items)} GitHub variables: {errors}")
+
+
+def _use_rest_for_secrets() -> bool:
+    """
+    Whether secrets are written with direct REST calls, unless `VAULTOPS_GH_USE_PYGITHUB` is true.
+    """
+    return str(os.getenv("VAULTOPS_GH_USE_PYGITHUB", "False")).lower() != "true"
 
-    if state == "absent" and visibility:
-        raise ValueError("visibility is not required for state absent")
 
-    if state == "present" and not unencrypted_value:
-        raise ValueError("unencrypted_value is required for state present")
+def _apply_variable(pat: str, api_ep: str, args: Dict[str, Any]) -> None:
+    """
+    Create, update or delete a secret or variable from arguments checked by `_prepare_variable_args`.
+
+    Writes of a value that is unchanged since the last successful write are skipped, unless `force` is set.
+    """
+    if args["state"] == "present" and not args["force"] and _is_value_unchanged(pat, api_ep, args):
+        LOGGER.info("GitHub variable %s is unchanged, skipping", args["name"])
+        return
+    _write_variable(pat=pat, api_ep=api_ep, args=args)
+    _record_written_value(pat=pat, api_ep=api_ep, args=args)
 
-    if is_base64_encoded:
-        unencrypted_value = base64.b64encode(unencrypted_value.encode()).decode()
 
-    if not visibility:
-        visibility = "all"
+def _write_variable(pat: str, api_ep: str, args: Dict[str, Any]) -> None:
+    """
+    Create, update or delete a secret or variable, without checking for unchanged values.
+    """
+    # pylint: disable=too-many-locals,too-many-branches,too-many-statements
+    name: str = args["name"]
+    unencrypted_value: Union[str, bytes] = args["unencrypted_value"]
+    environment: Optional[str] = args["environment"]
+    repository: Optional[str] = args["repository"]
+    organization: Optional[str] = args["organization"]
+    visibility: str = args["visibility"]
+    is_secret: bool = args["is_secret"]
+    state: str = args["state"]
+
+    if is_secret and _use_rest_for_secrets():
+        session: requests.Session = _get_session(pat)
+        if state == "present":
+            _put_secret(
+                session,
+                api_ep,
+                repository,
+                organization,
+                environment,
+                name,
+                unencrypted_value,
+                visibility if organization else None,
+            )
+        else:
+            scope: str = _secrets_scope(repository, organization, environment)
+            _send_with_retry(lambda: _raw_delete_secret(session, api_ep, scope, name))
+        return
 
-    auth = Auth.Token(pat)
-    github = Github(base_url=api_ep, auth=auth)
+    value: str = unencrypted_value.decode("utf-8") if isinstance(unencrypted_value, bytes) else unencrypted_value
     if state == "present":
         if repository:
-            repo = github.get_repo(repository)
+            repo = _get_gh_repo(api_ep, pat, repository)
             if environment:
                 env = repo.get_environment(environment)
                 if is_secret:
-                    env.create_secret(name, unencrypted_value)
+                    _send_with_retry(lambda: env.create_secret(name, value))
                 else:
-                    env.create_variable(name, unencrypted_value)
+                    _send_with_retry(lambda: env.create_variable(name, value))
             else:
                 if is_secret:
-                    repo.create_secret(name, unencrypted_value)
+                    _send_with_retry(lambda: repo.create_secret(name, value))
                 else:
-                    repo.create_variable(name, unencrypted_value)
+                    _send_with_retry(lambda: repo.create_variable(name, value))
         else:
-            org = github.get_organization(str(organization))
+            org = _get_gh_organization(api_ep, pat, str(organization))
             if is_secret:
-                org.create_secret(name, unencrypted_value, visibility)
+                _send_with_retry(lambda: org.create_secret(name, value, visibility))
             else:
-                org.create_variable(name, unencrypted_value, visibility)
+                _send_with_retry(lambda: org.create_variable(name, value, visibility))
     else:
-        if repository:
-            repo = github.get_repo(repository)
+        from github import GithubException  # pylint: disable=import-outside-toplevel
+
+        repo = _get_gh_repo(api_ep, pat, str(repository))
+        try:
             if environment:
                 env = repo.get_environment(environment)
                 if is_secret:
-                    env.delete_secret(name)
+                    _send_with_retry(lambda: env.delete_secret(name))
                 else:
-                    env.delete_variable(name)
+                    _send_with_retry(lambda: env.delete_variable(name))
             else:
                 if is_secret:
-                    repo.delete_secret(name)
+                    _send_with_retry(lambda: repo.delete_secret(name))
                 else:
-                    repo.delete_variable(name)
-        else:
-            raise ValueError("organization delete not supported")
-
-
-def github_release_search(
-    github_repo: str,
-    github_token: Optional[str] = os.getenv("GITHUB_TOKEN", None),
-    github_api_url: str = "https://api.github.com",
-    prefix: Optional[str] = None,
-    suffix: Optional[str] = None,
-    contains: Optional[str] = None,
-    max_pages: int = 100,
-    timeout: int = 10,
-) -> str:
-    """
-    Search for the latest release in a GitHub repository.
-
-    Args:
-        github_repo (str): The GitHub repository to search.
-        github_token (str):
-            The GitHub token to authenticate with. Optional.
-            Default is the `GITHUB_TOKEN` environment variable.
-        github_api_url (str): The GitHub API URL. Optional. Default is "https://api.github.com".
-        prefix (str): The prefix of the tag to search for. Optional.
-        suffix (str): The suffix of the tag to search for. Optional.
-        contains (str): The substring that the tag should contain. Optional.
-        max_pages (int): The maximum number of pages to search. Optional. Default is 100.
-        timeout (int): The timeout in seconds. Optional. Default is 10.
-
-    Raises:
-        ValueError:
-            If no matching tag is found.
-            If no releases are found for the repository.
-
-    Returns:
-        str: The latest tag in the GitHub repository.
-    """
-
-    tag_version: Optional[str] = None
-    url: str = f"{github_api_url}/repos/{github_repo}/releases"
-    headers: Dict[str, str] = {"Accept": "application/vnd.github.v3+json", "X-GitHub-Api-Version": "2022-11-28"}
-
-    if github_token:
-        headers["Authorization"] = f"Bearer {github_token}"
-
-    params: Dict[str, str | int] = {
-        "per_page": 50,
-    }
-    page_num: int = 0
-
-    while page_num < max_pages:
-        page_num += 1
-        params["page"] = page_num
-
-        response = requests.get(url, headers=headers, params=params, timeout=timeout)
-        response.raise_for_status()
-        if response.status_code != 200:
-            raise ValueError(f"Error fetching releases: {response.status_code}, {response.text}")
-        response_data = response.json()
-        if len(response_data) == 0:
-            raise ValueError(f"No releases found for {github_repo}")
-        for release in response_data:
-            tag_name = release.get("tag_name")
-
-            if tag_name:
-                if prefix and not tag_name.startswith(prefix):
-                    continue
-
-                if suffix and not tag_name.endswith(suffix):
-                    continue
-
-                if contains and contains not in tag_name:
-                    continue
-
-                tag_version = tag_name
-                break
-
-        if tag_version:
-            break
-
-    if not tag_version:
-        raise ValueError(f"No matching tag found for {github_repo}")
-
-    return tag_version
+                    _send_with_retry(lambda: repo.delete_variable(name))
+        except GithubException as e:
+            if e.status != 404:
+                raise
+            LOGGER.info("GitHub variable %s not found in %s, nothing to delete", name, repository)
@@ -0,0 +1,296 @@
+"""
+Module to search GitHub releases.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from .github_session import _get_session
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+LOGGER = logging.getLogger(__name__)
+
+# Process-local cache of github_release_search results, {key: (timestamp, tag_version)}.
+# Not shared between processes, and only as thread-safe as plain dict operations under the GIL.
+_RELEASE_SEARCH_CACHE: Dict[Tuple[str, Optional[str], Optional[str], Optional[str], str], Tuple[float, str]] = {}
+_RELEASE_SEARCH_CACHE_TTL_DEFAULT: int = 300
+
+# ETag of each fetched releases page, {(url, per_page, page): (etag, tag_names)}.
+# A matching `If-None-Match` returns 304 Not Modified, which does not count against the rate limit.
+_RELEASE_PAGE_ETAG_CACHE: Dict[Tuple[str, int, int], Tuple[str, List[str]]] = {}
+
+_GRAPHQL_RELEASES_QUERY: str = """
+query($owner: String!, $name: String!, $n: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    releases(first: $n, after: $after, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes { tagName }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+
+
+def _tag_predicate(prefix: Optional[str], suffix: Optional[str], contains: Optional[str]) -> Callable[[str], bool]:
+    """
+    Build the tag filter of `github_release_search` from only the filters that are set.
+    """
+    checks: List[Callable[[str], bool]] = []
+    if prefix:
+        tag_prefix: str = prefix
+        checks.append(lambda tag: tag.startswith(tag_prefix))
+    if suffix:
+        tag_suffix: str = suffix
+        checks.append(lambda tag: tag.endswith(tag_suffix))
+    if contains:
+        tag_contains: str = contains
+        checks.append(lambda tag: tag_contains in tag)
+
+    if not checks:
+        return bool
+    if len(checks) == 1:
+        return checks[0]
+    return lambda tag: all(check(tag) for check in checks)
+
+
+@functools.lru_cache(maxsize=4)
+def _release_search_cache_ttl(value: Optional[str]) -> int:
+    """
+    Parse the `VAULTOPS_GH_CACHE_TTL` value once, falling back to the default if it is unset or not an integer.
+    """
+    if value is None:
+        return _RELEASE_SEARCH_CACHE_TTL_DEFAULT
+    try:
+        return int(value)
+    except ValueError:
+        LOGGER.warning(
+            "Invalid VAULTOPS_GH_CACHE_TTL %r, using the default of %s seconds",
+            value,
+            _RELEASE_SEARCH_CACHE_TTL_DEFAULT,
+        )
+        return _RELEASE_SEARCH_CACHE_TTL_DEFAULT
+
+
+def _release_tag_names(response: requests.Response) -> List[str]:
+    """
+    Get the tag names from a releases page.
+
+    With `orjson` installed the page is parsed with it, otherwise with the standard `json` module.
+    Either way the response bytes are parsed as is, with no separate decode to `str`, and only the
+    tag names are kept.
+    """
+    releases: List[Dict[str, Any]]
+    if orjson is not None:
+        releases = orjson.loads(response.content)  # pylint: disable=no-member
+    else:
+        releases = json.loads(response.content)
+    return [release["tag_name"] for release in releases if release.get("tag_name")]
+
+
+def github_release_search(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    github_repo: str,
+    github_token: Optional[str] = os.getenv("GITHUB_TOKEN", None),
+    github_api_url: str = "https://api.github.com",
+    prefix: Optional[str] = None,
+    suffix: Optional[str] = None,
+    contains: Optional[str] = None,
+    max_pages: int = 100,
+    timeout: int = 10,
+) -> str:
+    """
+    Search for the latest release in a GitHub repository.
+
+    Args:
+        github_repo (str): The GitHub repository to search.
+        github_token (str):
+            The GitHub token to authenticate with. Optional.
+            Default is the `GITHUB_TOKEN` environment variable.
+        github_api_url (str): The GitHub API URL. Optional. Default is "https://api.github.com".
+        prefix (str): The prefix of the tag to search for. Optional.
+        suffix (str): The suffix of the tag to search for. Optional.
+        contains (str): The substring that the tag should contain. Optional.
+        max_pages (int): The maximum number of pages to search. Optional. Default is 100.
+        timeout (int): The timeout in seconds. Optional. Default is 10.
+
+    Matching tags are cached in-process for `VAULTOPS_GH_CACHE_TTL` seconds (default 300) keyed on the
+    repository, filters and API URL, so repeated searches within a run do not hit the API again.
+    Set `VAULTOPS_GH_CACHE_TTL` to 0 to disable the cache.
+
+    With a token and a filter, tag names are fetched newest first from the GraphQL API, 100 per request.
+    If the GraphQL search fails, the REST releases API is used instead.
+
+    Raises:
+        ValueError:
+            If no matching tag is found.
+            If no releases are found for the repository.
+
+    Returns:
+        str: The latest tag in the GitHub repository.
+    """
+
+    cache_ttl: int = _release_search_cache_ttl(os.getenv("VAULTOPS_GH_CACHE_TTL"))
+    cache_key = (github_repo, prefix, suffix, contains, github_api_url)
+    if cache_ttl > 0:
+        cached = _RELEASE_SEARCH_CACHE.get(cache_key)
+        if cached and time.monotonic() - cached[0] < cache_ttl:
+            return cached[1]
+
+    session: requests.Session = _get_session(github_token)
+    match: Callable[[str], bool] = _tag_predicate(prefix, suffix, contains)
+    tag_version: Optional[str] = None
+    searched: bool = False
+
+    # A filtered search is one GraphQL round trip per 100 tag names, instead of full REST release pages.
+    # GraphQL requires authentication, and any failure falls back to REST.
+    if github_token and (prefix or suffix or contains):
+        try:
+            tag_names: List[str] = _graphql_release_tag_names(
+                session, github_api_url, github_repo, match, max_pages, timeout
+            )
+            searched = True
+        except (requests.RequestException, KeyError, TypeError, ValueError) as e:
+            LOGGER.warning("GraphQL release search failed for %s, falling back to REST: %s", github_repo, e)
+        else:
+            if len(tag_names) == 0:
+                raise ValueError(f"No releases found for {github_repo}")
+            tag_version = next((tag_name for tag_name in tag_names if match(tag_name)), None)
+
+    if not searched:
+        tag_version = _rest_release_search(
+            session, github_api_url, github_repo, match, bool(prefix or suffix or contains), max_pages, timeout
+        )
+
+    if not tag_version:
+        raise ValueError(f"No matching tag found for {github_repo}")
+
+    if cache_ttl > 0:
+        _RELEASE_SEARCH_CACHE[cache_key] = (time.monotonic(), tag_version)
+
+    return tag_version
+
+
+def _rest_release_search(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    session: requests.Session,
+    github_api_url: str,
+    github_repo: str,
+    match: Callable[[str], bool],
+    filtered: bool,
+    max_pages: int,
+    timeout: int,
+) -> Optional[str]:
+    """
+    Page through the REST releases of a repository until a tag matches.
+
+    Raises:
+        ValueError: If a page has no releases.
+
+    Returns:
+        Optional[str]: The first matching tag, or None if there is none in `max_pages` pages.
+    """
+    tag_version: Optional[str] = None
+    url: str = f"{github_api_url}/repos/{github_repo}/releases"
+
+    # Without filters the newest release is the answer, so a single one-item page is enough.
+    per_page: int = 100 if filtered else 1
+    params: Dict[str, str | int] = {
+        "per_page": per_page,
+    }
+    page_num: int = 0
+
+    while page_num < max_pages:
+        page_num += 1
+        params["page"] = page_num
+
+        etag_cache_key = (url, per_page, page_num)
+        etag_cached = _RELEASE_PAGE_ETAG_CACHE.get(etag_cache_key)
+        request_headers: Dict[str, str] = {"If-None-Match": etag_cached[0]} if etag_cached else {}
+
+        tag_names: List[str]
+        with session.get(url, headers=request_headers, params=params, timeout=timeout) as response:
+            response.raise_for_status()
+            if response.status_code == 304 and etag_cached:
+                tag_names = etag_cached[1]
+            elif response.status_code == 200:
+                tag_names = _release_tag_names(response)
+                if "ETag" in response.headers:
+                    _RELEASE_PAGE_ETAG_CACHE[etag_cache_key] = (response.headers["ETag"], tag_names)
+            else:
+                raise ValueError(f"Error fetching releases: {response.status_code}, {response.text}")
+        if len(tag_names) == 0:
+            raise ValueError(f"No releases found for {github_repo}")
+        for tag_name in tag_names:
+            if match(tag_name):
+                tag_version = tag_name
+                break
+
+        if tag_version:
+            break
+
+    return tag_version
+
+
+def _graphql_url(github_api_url: str) -> str:
+    """
+    Get the GraphQL endpoint for a REST API URL, `https://HOST/api/v3` is `https://HOST/api/graphql` on GHES.
+    """
+    if github_api_url.rstrip("/").endswith("/api/v3"):
+        return github_api_url.rstrip("/")[: -len("/v3")] + "/graphql"
+    return f"{github_api_url.rstrip('/')}/graphql"
+
+
+def _graphql_release_tag_names(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    session: requests.Session,
+    github_api_url: str,
+    github_repo: str,
+    match: Callable[[str], bool],
+    max_pages: int,
+    timeout: int,
+) -> List[str]:
+    """
+    Get the release tag names of a repository, newest first, with the GraphQL API.
+
+    Pages of 100 tag names are fetched until one of them matches, or there are no more releases.
+
+    Raises:
+        ValueError: If the GraphQL API returned errors.
+
+    Returns:
+        List[str]: The tag names fetched.
+    """
+    owner, name = github_repo.split("/", 1)
+    tag_names: List[str] = []
+    cursor: Optional[str] = None
+
+    for _ in range(max_pages):
+        response = session.post(
+            _graphql_url(github_api_url),
+            json={
+                "query": _GRAPHQL_RELEASES_QUERY,
+                "variables": {"owner": owner, "name": name, "n": 100, "after": cursor},
+            },
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        data = response.json()
+        if data.get("errors"):
+            raise ValueError(f"GraphQL errors: {data['errors']}")
+        releases = data["data"]["repository"]["releases"]
+        page_tag_names: List[str] = [node["tagName"] for node in releases["nodes"] if node.get("tagName")]
+        tag_names.extend(page_tag_names)
+        if any(match(tag_name) for tag_name in page_tag_names) or not releases["pageInfo"]["hasNextPage"]:
+            break
+        cursor = releases["pageInfo"]["endCursor"]
+
+    return tag_names
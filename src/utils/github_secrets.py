@@ -0,0 +1,146 @@
+"""
+Raw GitHub REST client of Actions secrets, with the secrets public key cache.
+"""
+
+from __future__ import annotations
+
+import binascii
+import logging
+import urllib.parse
+from typing import Dict, Optional, Tuple, Union
+
+import requests
+
+from .github_session import _send_with_retry
+
+LOGGER = logging.getLogger(__name__)
+
+# Actions secrets public key per scope, {(api_ep, repository or organization, environment): (key_id, key)}.
+# The key rarely changes, so it is fetched once per process, and refreshed only if GitHub rejects it.
+_PUBKEY_CACHE: Dict[Tuple[str, str, Optional[str]], Tuple[str, str]] = {}
+
+
+def _secrets_scope(repository: Optional[str], organization: Optional[str], environment: Optional[str]) -> str:
+    """
+    Get the REST API path of the secrets collection for a repository, environment or organization.
+    """
+    if repository:
+        if environment:
+            return f"/repos/{repository}/environments/{urllib.parse.quote(environment, safe='')}/secrets"
+        return f"/repos/{repository}/actions/secrets"
+    return f"/orgs/{organization}/actions/secrets"
+
+
+def _pubkey_cache_key(
+    api_ep: str, repository: Optional[str], organization: Optional[str], environment: Optional[str]
+) -> Tuple[str, str, Optional[str]]:
+    return api_ep, str(repository or organization), environment if repository else None
+
+
+def _get_secrets_public_key(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    session: requests.Session,
+    api_ep: str,
+    repository: Optional[str],
+    organization: Optional[str],
+    environment: Optional[str],
+    timeout: int = 30,
+    refresh: bool = False,
+) -> Tuple[str, str]:
+    """
+    Get the public key used to encrypt secrets in the scope, from `_PUBKEY_CACHE` unless `refresh` is set.
+
+    Returns:
+        Tuple[str, str]: The key id and the base64 encoded public key.
+    """
+    cache_key = _pubkey_cache_key(api_ep, repository, organization, environment)
+    if refresh or cache_key not in _PUBKEY_CACHE:
+        scope: str = _secrets_scope(repository, organization, environment)
+        response = session.get(f"{api_ep}{scope}/public-key", timeout=timeout)
+        response.raise_for_status()
+        public_key = response.json()
+        _PUBKEY_CACHE[cache_key] = (public_key["key_id"], public_key["key"])
+    return _PUBKEY_CACHE[cache_key]
+
+
+def _put_secret(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    session: requests.Session,
+    api_ep: str,
+    repository: Optional[str],
+    organization: Optional[str],
+    environment: Optional[str],
+    name: str,
+    unencrypted_value: Union[str, bytes],
+    visibility: Optional[str] = None,
+) -> None:
+    """
+    Encrypt a secret with the cached scope public key and PUT it.
+
+    If GitHub rejects the write with 422, the key may have been rotated, so it is fetched again and the
+    write is retried once.
+    """
+    scope: str = _secrets_scope(repository, organization, environment)
+    refresh: bool = False
+    while True:
+        key_id, public_key = _get_secrets_public_key(
+            session, api_ep, repository, organization, environment, refresh=refresh
+        )
+        encrypted_value = _encrypt_secret(public_key, unencrypted_value)
+        try:
+            _send_with_retry(lambda: _raw_put_secret(session, api_ep, scope, name, encrypted_value, key_id, visibility))
+            return
+        except requests.HTTPError as e:
+            if refresh or e.response is None or e.response.status_code != 422:
+                raise
+            LOGGER.info("GitHub rejected the secret %s, refreshing the public key of %s", name, scope)
+            refresh = True
+
+
+def _b64(value: Union[str, bytes]) -> str:
+    """
+    Base64 encode a value, `str` values are UTF-8 encoded first.
+    """
+    data: bytes = value.encode("utf-8") if isinstance(value, str) else value
+    return binascii.b2a_base64(data, newline=False).decode("ascii")
+
+
+def _encrypt_secret(public_key: str, unencrypted_value: Union[str, bytes]) -> str:
+    """
+    Encrypt a secret value with the scope public key, the same way PyGithub does.
+    """
+    from nacl.encoding import Base64Encoder  # pylint: disable=import-outside-toplevel
+    from nacl.public import PublicKey, SealedBox  # pylint: disable=import-outside-toplevel
+
+    sealed_box = SealedBox(PublicKey(public_key.encode("utf-8"), Base64Encoder))
+    data: bytes = unencrypted_value.encode("utf-8") if isinstance(unencrypted_value, str) else unencrypted_value
+    return _b64(sealed_box.encrypt(data))
+
+
+def _raw_put_secret(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    session: requests.Session,
+    api_ep: str,
+    scope: str,
+    name: str,
+    encrypted_value: str,
+    key_id: str,
+    visibility: Optional[str] = None,
+    timeout: int = 30,
+) -> None:
+    """
+    Create or update a secret in the scope with a single PUT.
+    """
+    body: Dict[str, str] = {"encrypted_value": encrypted_value, "key_id": key_id}
+    if visibility:
+        body["visibility"] = visibility
+    response = session.put(f"{api_ep}{scope}/{urllib.parse.quote(name, safe='')}", json=body, timeout=timeout)
+    response.raise_for_status()
+
+
+def _raw_delete_secret(session: requests.Session, api_ep: str, scope: str, name: str, timeout: int = 30) -> None:
+    """
+    Delete a secret in the scope with a single DELETE.
+    """
+    response = session.delete(f"{api_ep}{scope}/{urllib.parse.quote(name, safe='')}", timeout=timeout)
+    if response.status_code == 404:
+        LOGGER.info("GitHub secret %s not found in %s, nothing to delete", name, scope)
+        return
+    response.raise_for_status()
@@ -0,0 +1,201 @@
+"""
+Module to manage GitHub Action Secrets concurrently with `aiohttp`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import urllib.parse
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .github_secrets import _PUBKEY_CACHE, _encrypt_secret, _pubkey_cache_key, _secrets_scope
+from .github_session import _WRITE_RETRY_ATTEMPTS, _rate_limit_sleep_seconds
+from .github_variable_args import _needs_public_key, _prepare_variable_args, _secret_scope_of
+from .github_written_values import _is_value_unchanged, _record_written_value, _save_written_values
+
+if TYPE_CHECKING:
+    import aiohttp  # type: ignore
+
+LOGGER = logging.getLogger(__name__)
+
+
+async def github_variables_async(  # pylint: disable=too-many-locals
+    pat: str,
+    items: List[Dict[str, Any]],
+    api_ep: str = "https://api.github.com",
+    limit_per_host: int = 8,
+) -> None:
+    """
+    Creates or deletes many secrets concurrently with `aiohttp`, on a single event loop.
+
+    Requires the optional `aiohttp` dependency. Values are encrypted before the requests are sent,
+    and one `aiohttp.ClientSession` is shared by the whole batch.
+    If the public key of a scope cannot be fetched, only the secrets of that scope fail.
+
+    Parameters:
+        pat: (str): The personal access token (PAT) to authenticate with GitHub. Required.
+        items: (List[Dict[str, Any]]): The `github_variable` keyword arguments, other than `pat` and `api_ep`,
+            for each secret. Required.
+        api_ep: (str): The GitHub API endpoint. Optional.
+        limit_per_host: (int): The maximum number of concurrent connections. Optional. Default is 8.
+
+    Raises:
+        ValueError: If any item is invalid or not a secret, or if any of the operations failed.
+    """
+    import aiohttp  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+    prepared_items: List[Dict[str, Any]] = [_prepare_variable_args(item) for item in items]
+    variables = [item["name"] for item in prepared_items if not item["is_secret"]]
+    if variables:
+        raise ValueError(f"github_variables_async only supports secrets, {variables}")
+
+    headers: Dict[str, str] = {
+        "Authorization": f"Bearer {pat}",
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit_per_host=limit_per_host),
+        timeout=aiohttp.ClientTimeout(total=30),
+        cookie_jar=aiohttp.DummyCookieJar(),
+        headers=headers,
+    ) as session:
+        scopes = list(
+            {
+                _secret_scope_of(item)
+                for item in prepared_items
+                if _needs_public_key(pat, api_ep, item)
+                and _pubkey_cache_key(api_ep, *_secret_scope_of(item)) not in _PUBKEY_CACHE
+            }
+        )
+        key_results = await asyncio.gather(
+            *(_async_load_public_key(session, api_ep, *scope) for scope in scopes), return_exceptions=True
+        )
+        # Items of a scope whose public key could not be fetched fail without being sent.
+        scope_errors: Dict[Tuple[Optional[str], Optional[str], Optional[str]], BaseException] = {}
+        for scope, key_result in zip(scopes, key_results):
+            if isinstance(key_result, BaseException):
+                LOGGER.error(
+                    "Error fetching the GitHub secrets public key of %s: %s", _secrets_scope(*scope), key_result
+                )
+                scope_errors[scope] = key_result
+        results = await asyncio.gather(
+            *(
+                (
+                    _async_scope_error(scope_errors[_secret_scope_of(item)])
+                    if _secret_scope_of(item) in scope_errors and _needs_public_key(pat, api_ep, item)
+                    else _async_apply_secret(session, pat, api_ep, item)
+                )
+                for item in prepared_items
+            ),
+            return_exceptions=True,
+        )
+
+    await asyncio.to_thread(_save_written_values)
+
+    errors: List[str] = []
+    for item, result in zip(prepared_items, results):
+        if isinstance(result, BaseException):
+            LOGGER.error("Error setting up GitHub secret %s: %s", item["name"], result)
+            errors.append(f"{item['name']}: {result}")
+    if errors:
+        raise ValueError(f"Error setting up {len(errors)} of {len(prepared_items)} GitHub secrets: {errors}")
+
+
+async def _async_scope_error(error: BaseException) -> None:
+    """
+    Fail a secret with the error of its scope.
+    """
+    raise error
+
+
+async def _async_load_public_key(
+    session: aiohttp.ClientSession,
+    api_ep: str,
+    repository: Optional[str],
+    organization: Optional[str],
+    environment: Optional[str],
+) -> None:
+    """
+    Fetch the public key of a secrets scope into `_PUBKEY_CACHE`.
+    """
+    scope: str = _secrets_scope(repository, organization, environment)
+    public_key = await _async_send_with_retry(session, "GET", f"{api_ep}{scope}/public-key")
+    _PUBKEY_CACHE[_pubkey_cache_key(api_ep, repository, organization, environment)] = (
+        public_key["key_id"],
+        public_key["key"],
+    )
+
+
+async def _async_send_with_retry(session: aiohttp.ClientSession, method: str, url: str, **kwargs: Any) -> Any:
+    """
+    Send a GitHub request, retrying when rate limited, like `_send_with_retry`.
+
+    Raises:
+        aiohttp.ClientResponseError: If the final response is an error.
+
+    Returns:
+        Any: The JSON body of a GET response, None for other methods.
+    """
+    attempt: int = 0
+    while True:
+        async with session.request(method, url, **kwargs) as response:
+            sleep_seconds = _rate_limit_sleep_seconds(response.status, dict(response.headers), attempt)
+            if sleep_seconds is None or attempt >= _WRITE_RETRY_ATTEMPTS:
+                response.raise_for_status()
+                return await response.json() if method == "GET" else None
+        attempt += 1
+        LOGGER.warning("GitHub rate limit hit, retry %s in %.1f seconds", attempt, sleep_seconds)
+        await asyncio.sleep(sleep_seconds)
+
+
+async def _async_apply_secret(session: aiohttp.ClientSession, pat: str, api_ep: str, args: Dict[str, Any]) -> None:
+    """
+    Create, update or delete a secret from arguments checked by `_prepare_variable_args`.
+
+    Like `_apply_variable`, writes of an unchanged value are skipped unless `force` is set, and like `_put_secret`,
+    a write rejected with 422 is retried once with a refreshed public key.
+    """
+    # pylint: disable=too-many-locals
+    import aiohttp  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+    if args["state"] == "present" and not args["force"] and _is_value_unchanged(pat, api_ep, args):
+        LOGGER.info("GitHub secret %s is unchanged, skipping", args["name"])
+        return
+
+    repository, organization, environment = _secret_scope_of(args)
+    scope: str = _secrets_scope(repository, organization, environment)
+    url: str = f"{api_ep}{scope}/{urllib.parse.quote(args['name'], safe='')}"
+
+    if args["state"] == "absent":
+        try:
+            await _async_send_with_retry(session, "DELETE", url)
+        except aiohttp.ClientResponseError as e:
+            if e.status != 404:
+                raise
+            LOGGER.info("GitHub secret %s not found in %s, nothing to delete", args["name"], scope)
+        _record_written_value(pat=pat, api_ep=api_ep, args=args)
+        return
+
+    cache_key = _pubkey_cache_key(api_ep, repository, organization, environment)
+    refresh: bool = False
+    while True:
+        if refresh or cache_key not in _PUBKEY_CACHE:
+            await _async_load_public_key(session, api_ep, repository, organization, environment)
+        key_id, public_key = _PUBKEY_CACHE[cache_key]
+        body: Dict[str, str] = {
+            "encrypted_value": _encrypt_secret(public_key, args["unencrypted_value"]),
+            "key_id": key_id,
+        }
+        if organization:
+            body["visibility"] = args["visibility"]
+        try:
+            await _async_send_with_retry(session, "PUT", url, json=body)
+            break
+        except aiohttp.ClientResponseError as e:
+            if refresh or e.status != 422:
+                raise
+            LOGGER.info("GitHub rejected the secret %s, refreshing the public key of %s", args["name"], scope)
+            refresh = True
+    _record_written_value(pat=pat, api_ep=api_ep, args=args)
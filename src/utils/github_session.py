@@ -0,0 +1,145 @@
+"""
+Pooled GitHub REST sessions, and rate limit aware retries of GitHub writes.
+"""
+
+from __future__ import annotations
+
+import datetime
+import email.utils
+import logging
+import math
+import sys
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# Retries idempotent requests on rate limits and transient server errors, honoring `Retry-After`.
+_SESSION_RETRY = Retry(
+    total=5,
+    backoff_factor=1.0,
+    status_forcelist=(429, 500, 502, 503, 504),
+    respect_retry_after_header=True,
+    allowed_methods=frozenset(["GET", "HEAD"]),
+)
+_WRITE_RETRY_ATTEMPTS: int = 3
+_WRITE_RETRY_MAX_SLEEP: float = 60.0
+
+_SESSIONS: Dict[Optional[str], requests.Session] = {}
+
+
+def _get_session(token: Optional[str] = None) -> requests.Session:
+    """
+    Get a pooled `requests.Session` for the given token.
+
+    Sessions are created lazily and reused for the lifetime of the process, so repeated calls to
+    the same host share keep-alive connections instead of doing a new TCP + TLS handshake each time.
+    The static GitHub headers (and the `Authorization` header, if a token is given) are set once on
+    the session.
+
+    Args:
+        token (str): The GitHub token to authenticate with. Optional.
+
+    Returns:
+        requests.Session: The session for the token.
+    """
+    session = _SESSIONS.get(token)
+    if session is None:
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=_SESSION_RETRY))
+        session.headers.update({"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"})
+        if token:
+            session.headers["Authorization"] = f"Bearer {token}"
+        _SESSIONS[token] = session
+    return session
+
+
+def _rate_limit_sleep_seconds(status: int, headers: Dict[str, str], attempt: int) -> Optional[float]:
+    """
+    Get how long to wait before retrying a rate limited write.
+
+    Returns None if the response is not a rate limit (429, or 403 with no remaining quota).
+    Otherwise uses `Retry-After` (seconds or an HTTP date) or `X-RateLimit-Reset` (epoch seconds) if
+    present and valid, falling back to 1s, 2s, 4s, ...
+    """
+    headers = {k.lower(): v for k, v in headers.items()}
+    if status != 429 and not (status == 403 and headers.get("x-ratelimit-remaining") == "0"):
+        return None
+    sleep_seconds: Optional[float] = None
+    if "retry-after" in headers:
+        sleep_seconds = _parse_retry_after(headers["retry-after"])
+    elif "x-ratelimit-reset" in headers:
+        try:
+            sleep_seconds = float(headers["x-ratelimit-reset"]) - time.time()
+        except ValueError:
+            sleep_seconds = None
+    if sleep_seconds is None or math.isnan(sleep_seconds):
+        sleep_seconds = 2.0**attempt
+    return min(max(sleep_seconds, 0.0), _WRITE_RETRY_MAX_SLEEP)
+
+
+def _parse_retry_after(value: str) -> Optional[float]:
+    """
+    Get the seconds to wait from a `Retry-After` header, either delay seconds or an HTTP date.
+
+    Returns None if the value is neither.
+    """
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        retry_at: datetime.datetime = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    return retry_at.timestamp() - time.time()
+
+
+def _send_with_retry(func: Callable[[], _T]) -> _T:
+    """
+    Call a GitHub write operation, retrying up to `_WRITE_RETRY_ATTEMPTS` times when rate limited.
+
+    Both PyGithub (`GithubException`) and raw session (`requests.HTTPError`) failures are retried.
+
+    Args:
+        func (Callable): The operation to call.
+
+    Returns:
+        The result of the operation.
+    """
+    attempt: int = 0
+    while True:
+        try:
+            return func()
+        except Exception as e:  # pylint: disable=broad-except
+            sleep_seconds = _error_rate_limit_sleep_seconds(e, attempt)
+            if sleep_seconds is None or attempt >= _WRITE_RETRY_ATTEMPTS:
+                raise
+            attempt += 1
+            LOGGER.warning("GitHub rate limit hit, retry %s in %.1f seconds", attempt, sleep_seconds)
+            time.sleep(sleep_seconds)
+
+
+def _error_rate_limit_sleep_seconds(error: Exception, attempt: int) -> Optional[float]:
+    """
+    Get how long to wait before retrying a failed write, or None if the error is not a rate limit.
+
+    PyGithub is only imported by the code paths that use it, so it is looked up in `sys.modules` instead
+    of being imported here, and an error cannot be a `GithubException` if `github` was never loaded.
+    """
+    if isinstance(error, requests.HTTPError):
+        if error.response is None:
+            return None
+        return _rate_limit_sleep_seconds(error.response.status_code, dict(error.response.headers), attempt)
+    github = sys.modules.get("github")
+    if github is not None and isinstance(error, github.GithubException):
+        return _rate_limit_sleep_seconds(error.status, dict(error.headers or {}), attempt)
+    return None
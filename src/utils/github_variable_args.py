@@ -0,0 +1,101 @@
+"""
+Validation and defaults of the `github_variable` arguments.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .github_secrets import _b64
+from .github_written_values import _is_value_unchanged
+
+LOGGER = logging.getLogger(__name__)
+
+_VALID_STATES = frozenset(("present", "absent"))
+_VALID_VISIBILITY = frozenset(("private", "all", "selected"))
+
+# (predicate, error_message) pairs checked by github_variable, a predicate returning True is an error.
+# The message is formatted with the arguments, e.g. "{state}".
+_VALIDATORS: Tuple[Tuple[Callable[[Dict[str, Any]], bool], str], ...] = (
+    (lambda a: bool(a["repository"] and a["organization"]), "repository and organization are mutually exclusive"),
+    (lambda a: bool(a["repository"] and a["visibility"]), "repository and visibility are mutually exclusive"),
+    (lambda a: not a["repository"] and not a["organization"], "repository or organization is mandatory"),
+    (lambda a: bool(a["organization"] and a["environment"]), "organization and environment are mutually exclusive"),
+    (lambda a: a["state"] not in _VALID_STATES, "state should be either present or absent, {state}"),
+    (
+        lambda a: bool(a["visibility"]) and a["visibility"] not in _VALID_VISIBILITY,
+        "visibility should in 'private', 'all', 'selected'",
+    ),
+    (
+        lambda a: a["state"] == "absent" and bool(a["unencrypted_value"]),
+        "unencrypted_value is not required for state absent",
+    ),
+    (
+        lambda a: a["state"] == "absent" and bool(a["is_base64_encoded"]),
+        "is_base64_encoded is not required for state absent",
+    ),
+    (lambda a: a["state"] == "absent" and bool(a["visibility"]), "visibility is not required for state absent"),
+    (
+        lambda a: a["state"] == "present" and not a["unencrypted_value"],
+        "unencrypted_value is required for state present",
+    ),
+    (lambda a: a["state"] == "absent" and not a["repository"], "organization delete not supported"),
+)
+
+# Defaults of the optional github_variable arguments, also used for github_variables_bulk items.
+_VARIABLE_ARG_DEFAULTS: Dict[str, Any] = {
+    "environment": None,
+    "repository": None,
+    "organization": None,
+    "is_base64_encoded": False,
+    "visibility": None,
+    "is_secret": True,
+    "state": "present",
+    "force": False,
+}
+
+
+def _secret_scope_of(args: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Get the (repository, organization, environment) secrets scope of checked `github_variable` arguments.
+    """
+    return args["repository"], args["organization"], args["environment"]
+
+
+def _needs_public_key(pat: str, api_ep: str, args: Dict[str, Any]) -> bool:
+    """
+    Whether writing a secret from checked `github_variable` arguments needs the scope public key.
+    """
+    return (
+        args["is_secret"]
+        and args["state"] == "present"
+        and (args["force"] or not _is_value_unchanged(pat, api_ep, args))
+    )
+
+
+def _prepare_variable_args(args: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate `github_variable` arguments and fill in the defaults.
+
+    Raises:
+        ValueError: If the arguments are invalid.
+    """
+    unknown_args = set(args) - set(_VARIABLE_ARG_DEFAULTS) - {"name", "unencrypted_value"}
+    if unknown_args:
+        raise ValueError(f"unknown arguments {sorted(unknown_args)}")
+    if "name" not in args:
+        raise ValueError("name is mandatory")
+
+    args = {**_VARIABLE_ARG_DEFAULTS, "unencrypted_value": "", **args}
+    for predicate, error_message in _VALIDATORS:
+        if predicate(args):
+            raise ValueError(error_message.format(**args))
+
+    if args["is_base64_encoded"]:
+        args["unencrypted_value"] = _b64(args["unencrypted_value"])
+
+    if not args["visibility"]:
+        args["visibility"] = "all"
+
+    return args
@@ -0,0 +1,105 @@
+"""
+On-disk cache of keyed hashes of the GitHub secrets and variables written by this machine.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Union
+
+from .github_secrets import _secrets_scope
+
+LOGGER = logging.getLogger(__name__)
+
+# Keyed hashes of the values last written by this machine, {"api_ep|kind|scope|name": hmac_sha256}, so
+# re-runs can skip writes that would not change anything. Loaded from `_written_values_path()` on first use.
+_WRITTEN_VALUES: Optional[Dict[str, str]] = None
+_WRITTEN_VALUES_DIRTY: bool = False
+_WRITTEN_VALUES_LOCK = threading.Lock()
+
+
+def _written_values_path() -> str:
+    """
+    Get the path of the file with the hashes of the written values.
+    """
+    cache_home: str = os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(cache_home, "vaultops", "secret_hashes.json")
+
+
+def _written_value_key(api_ep: str, args: Dict[str, Any]) -> str:
+    kind: str = "secret" if args["is_secret"] else "variable"
+    scope: str = _secrets_scope(args["repository"], args["organization"], args["environment"])
+    return f"{api_ep}|{kind}|{scope}|{args['name']}"
+
+
+def _written_value_hash(pat: str, key: str, args: Dict[str, Any]) -> str:
+    """
+    Hash a value with HMAC-SHA256 keyed by the token, so the cache file cannot be used to guess secret values.
+    """
+    value: Union[str, bytes] = args["unencrypted_value"]
+    data: bytes = value.encode("utf-8") if isinstance(value, str) else value
+    message: bytes = f"{key}|{args['visibility']}|".encode("utf-8") + data
+    return hmac.new(pat.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+def _load_written_values() -> Dict[str, str]:
+    """
+    Get the hashes of the written values, loading them from disk on first use. Callers hold the lock.
+    """
+    global _WRITTEN_VALUES  # pylint: disable=global-statement
+    if _WRITTEN_VALUES is None:
+        try:
+            with open(_written_values_path(), "r", encoding="utf-8") as f:
+                _WRITTEN_VALUES = dict(json.load(f))
+        except (OSError, ValueError, TypeError):
+            _WRITTEN_VALUES = {}
+    return _WRITTEN_VALUES
+
+
+def _is_value_unchanged(pat: str, api_ep: str, args: Dict[str, Any]) -> bool:
+    """
+    Whether the value was already written by this machine with the same token.
+    """
+    key: str = _written_value_key(api_ep, args)
+    with _WRITTEN_VALUES_LOCK:
+        return _load_written_values().get(key) == _written_value_hash(pat, key, args)
+
+
+def _record_written_value(pat: str, api_ep: str, args: Dict[str, Any]) -> None:
+    """
+    Store the hash of a written value, or drop it for a delete, in memory until `_save_written_values`.
+    """
+    global _WRITTEN_VALUES_DIRTY  # pylint: disable=global-statement
+    key: str = _written_value_key(api_ep, args)
+    with _WRITTEN_VALUES_LOCK:
+        written_values = _load_written_values()
+        if args["state"] == "present":
+            written_values[key] = _written_value_hash(pat, key, args)
+        elif written_values.pop(key, None) is None:
+            return
+        _WRITTEN_VALUES_DIRTY = True
+
+
+def _save_written_values() -> None:
+    """
+    Save the hashes of the written values to disk, if any were recorded since the last save.
+    """
+    global _WRITTEN_VALUES_DIRTY  # pylint: disable=global-statement
+    path: str = _written_values_path()
+    with _WRITTEN_VALUES_LOCK:
+        if not _WRITTEN_VALUES_DIRTY:
+            return
+        _WRITTEN_VALUES_DIRTY = False
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8") as f:
+                json.dump(_load_written_values(), f, indent=2, sort_keys=True)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            LOGGER.warning("Unable to save GitHub variable hashes to %s: %s", path, e)
@@ -66,6 +66,7 @@ def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--inventory", default="inventory.yml")
     parser.add_argument("--github", action=argparse.BooleanOptionalAction, default=False)
+    parser.add_argument("--force", action=argparse.BooleanOptionalAction, default=False)
     args = parser.parse_args()
     max_vaultops_retries: int = 5
     max_vaultops_retry_wait: int = 10
@@ -79,7 +80,7 @@ def main() -> None:
             if args.github:
                 # Add vault access to GitHub user repositories
                 LOGGER.info("Adding vault access to GitHub user repositories")
-                setup_github(vault_ha_client=vault_ha_client)
+                setup_github(vault_ha_client=vault_ha_client, force=args.force)
 
             break
 
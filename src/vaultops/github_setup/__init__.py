@@ -2,16 +2,19 @@
 This module provides functionality to set up GitHub access for the bot and users.
 
 Functions:
-    setup_github(vault_ha_client: VaultHaClient) -> None:
+    setup_github(vault_ha_client: VaultHaClient, force: bool = False) -> None:
         Sets up GitHub access for the bot and users by adding vault access to GitHub user repositories
-        and adding a GPG key to the bot GitHub account.
+        and adding a GPG key to the bot GitHub account, concurrently.
 
 Modules:
     github: Contains functions to add vault access to GitHub.
     github_bot: Contains functions to add GPG keys to the bot GitHub account.
 """
 
+import concurrent.futures
+import functools
 import logging
+from typing import Callable, Dict
 
 from ..models.ha_client import VaultHaClient
 from .github import add_vault_access_to_github
@@ -20,13 +23,36 @@ from .github_bot import add_gpg_to_bot_github
 LOGGER = logging.getLogger(__name__)
 
 
-def setup_github(vault_ha_client: VaultHaClient) -> None:
+def setup_github(vault_ha_client: VaultHaClient, force: bool = False) -> None:
     """
     Setup GitHub access for the bot and users.
+
+    Args:
+        vault_ha_client (VaultHaClient): The vault client.
+        force (bool): Write the repository secrets even if they are unchanged since the last run.
     """
 
-    LOGGER.info("Adding vault access to GitHub user repositories")
-    add_vault_access_to_github(vault_ha_client=vault_ha_client)
+    # Log in once up front, so the two tasks do not both log in to vault on the shared hvac client.
+    vault_ha_client.hvac_client()
+
+    tasks: Dict[str, Callable[..., None]] = {
+        "Adding vault access to GitHub user repositories": functools.partial(add_vault_access_to_github, force=force),
+        "Add gpg key to bot GitHub account": add_gpg_to_bot_github,
+    }
+
+    # The tasks are IO bound and independent, one touches the user repositories and the other the bot account.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = [
+            executor.submit(_run_task, description, task, vault_ha_client) for description, task in tasks.items()
+        ]
+        for future in futures:
+            future.result()
 
-    LOGGER.info("Add gpg key to bot GitHub account")
-    add_gpg_to_bot_github(vault_ha_client=vault_ha_client)
+
+def _run_task(description: str, task: Callable[..., None], vault_ha_client: VaultHaClient) -> None:
+    """
+    Run a GitHub setup task, logging when it starts and finishes.
+    """
+    LOGGER.info("%s: started", description)
+    task(vault_ha_client=vault_ha_client)
+    LOGGER.info("%s: finished", description)
@@ -2,13 +2,15 @@
 This module provides functions to integrate Vault access with GitHub repositories.
 
 Functions:
-    add_vault_access_to_github(vault_ha_client: VaultHaClient) -> None:
+    add_vault_access_to_github(vault_ha_client: VaultHaClient, force: bool = False) -> None:
         Adds Vault access to GitHub user repositories.
 
     __get_access_secrets(vault_ha_client: VaultHaClient, github_user: str, repo_name: str) -> Optional[Dict[str, str]]:
         Retrieves access secrets for a given GitHub user and repository.
 
-    __set_up_github_access_credential(access_secrets: Dict[str, str], repository_full_name: str, pat: str) -> None:
+    __set_up_github_access_credential(
+        access_secrets: Dict[str, str], repository_full_name: str, pat: str, force: bool = False
+    ) -> None:
         Sets up GitHub repository with the provided access secrets.
 
     _get_bot_account(client: hvac.Client) -> Optional[Union[NamedUser, AuthenticatedUser]]:
@@ -33,11 +35,12 @@ from ..models.ha_client import VaultHaClient
 LOGGER = logging.getLogger(__name__)
 
 
-def add_vault_access_to_github(vault_ha_client: VaultHaClient) -> None:
+def add_vault_access_to_github(vault_ha_client: VaultHaClient, force: bool = False) -> None:
     """
     This function will add the vault access to the GitHub repository.
     Args:
         vault_ha_client (VaultHaClient): The vault client.
+        force (bool): Write the secrets even if they are unchanged since the last run.
     """
     LOGGER.info("Adding vault access to GitHub user repositories")
 
@@ -77,6 +80,7 @@ def add_vault_access_to_github(vault_ha_client: VaultHaClient) -> None:
                     access_secrets=vault_access_secrets,
                     repository_full_name=repo.full_name,
                     pat=github_prod_secret_dict["GH_PROD_API_TOKEN"],
+                    force=force,
                 )
                 if github_bot_user:
                     LOGGER.info("Adding bot as collaborator to %s repository", repo.full_name)
@@ -135,13 +139,15 @@ def __get_access_secrets(vault_ha_client: VaultHaClient, github_user: str, repo_
     return vault_access_secrets
 
 
-def __set_up_github_access_credential(access_secrets: Dict[str, str], repository_full_name: str, pat: str) -> None:
+def __set_up_github_access_credential(
+    access_secrets: Dict[str, str], repository_full_name: str, pat: str, force: bool = False
+) -> None:
     """
     This function will set up the GitHub repository.
     """
     for key, value in access_secrets.items():
         LOGGER.debug("Setting up GitHub repository: %s, key: %s", repository_full_name, key)
-        github_variable(pat=pat, unencrypted_value=value, repository=repository_full_name, name=key)
+        github_variable(pat=pat, unencrypted_value=value, repository=repository_full_name, name=key, force=force)
 
 
 def _get_bot_account(client: hvac.Client) -> Optional[Union[NamedUser, AuthenticatedUser]]:
@@ -13,14 +13,19 @@ Dependencies:
     - typing.Optional
     - cryptography.hazmat.primitives.asymmetric.rsa.RSAPrivateKey
     - pydantic.BaseModel
+    - pydantic.ConfigDict
     - pydantic.Field
 """
 
+from __future__ import annotations
+
 import dataclasses
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
 
-from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
-from pydantic import BaseModel, Field
+if TYPE_CHECKING:
+    from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
 
 
 class PrivateKeyProperties(BaseModel):
@@ -28,19 +33,21 @@ class PrivateKeyProperties(BaseModel):
     Represents the properties of a private key.
 
     Attributes:
+        model_config (ConfigDict): The model configuration.
         private_key_content (Optional[str]): Content of the private key.
         private_key_passphrase (Optional[str]): Passphrase for the private key.
         public_exponent (int): Public exponent for the RSA key.
         key_size (int): Size of the key.
     """
 
+    model_config = ConfigDict(frozen=True)
     private_key_content: Optional[str] = Field(default=None, description="Content of the private key")
     private_key_passphrase: Optional[str] = Field(default=None, description="Passphrase for the private key")
     public_exponent: int = Field(default=65537, description="Public exponent for the RSA key")
     key_size: int = Field(default=2048, description="Size of the key")
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, frozen=True)
 class GeneratedPrivateKey:
     """
     Represents a generated private key.
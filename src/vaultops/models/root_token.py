@@ -16,7 +16,7 @@ Classes:
 
 from typing import Any, Dict, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class VaultNewRootToken(BaseModel):
@@ -24,6 +24,9 @@ class VaultNewRootToken(BaseModel):
     Represents the response for generating a new root token in HashiCorp Vault.
 
     Attributes:
+        model_config (ConfigDict):
+            - The model configuration, frozen so the fields cannot be reassigned.
+            - The model is not hashable, because `generate_root_response` is a dict.
         otp (str): The one-time password used for generating the root token.
         generate_root_response (Dict[str, Any]):
             - The response received from the Vault API when generating the root token.
@@ -31,6 +34,7 @@ class VaultNewRootToken(BaseModel):
         new_root (Optional[str]): The new root token value, if generated successfully. Defaults to None.
     """
 
+    model_config = ConfigDict(frozen=True)
     otp: str
     generate_root_response: Dict[str, Any]
     encoded_root_token: str
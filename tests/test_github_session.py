@@ -0,0 +1,110 @@
+"""
+Tests of the rate limit aware retries of GitHub writes in `utils.github_session`.
+"""
+
+from typing import Dict, Optional
+from unittest import mock
+
+import pytest
+import requests
+
+from utils.github_secrets import _raw_put_secret
+from utils.github_session import _WRITE_RETRY_ATTEMPTS, _rate_limit_sleep_seconds, _send_with_retry
+
+API_EP = "https://api.github.test"
+SCOPE = "/repos/owner/repo/actions/secrets"
+
+
+def _response(status_code: int, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response.url = f"{API_EP}{SCOPE}/NAME"
+    return response
+
+
+def _put_secret_with_retry(session: requests.Session) -> None:
+    _send_with_retry(lambda: _raw_put_secret(session, API_EP, SCOPE, "NAME", "encrypted", "key-id"))
+
+
+def test_retries_429_then_succeeds() -> None:
+    """
+    A 429 is retried after `Retry-After` seconds, and the next success is returned.
+    """
+    session = requests.Session()
+    responses = [_response(429, {"Retry-After": "2"}), _response(201)]
+    with mock.patch.object(requests.Session, "put", side_effect=responses) as put, mock.patch(
+        "utils.github_session.time.sleep"
+    ) as sleep:
+        _put_secret_with_retry(session)
+
+    assert put.call_count == 2
+    sleep.assert_called_once_with(2.0)
+
+
+def test_retries_403_with_no_remaining_quota() -> None:
+    """
+    A 403 with no remaining quota is a rate limit, and is retried.
+    """
+    session = requests.Session()
+    responses = [_response(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"}), _response(204)]
+    with mock.patch.object(requests.Session, "put", side_effect=responses) as put, mock.patch(
+        "utils.github_session.time.sleep"
+    ) as sleep:
+        _put_secret_with_retry(session)
+
+    assert put.call_count == 2
+    sleep.assert_called_once_with(0.0)
+
+
+def test_gives_up_after_write_retry_attempts() -> None:
+    """
+    The rate limit error is raised once `_WRITE_RETRY_ATTEMPTS` retries are used up.
+    """
+    session = requests.Session()
+    responses = [_response(429, {"Retry-After": "1"}) for _ in range(_WRITE_RETRY_ATTEMPTS + 1)]
+    with mock.patch.object(requests.Session, "put", side_effect=responses) as put, mock.patch(
+        "utils.github_session.time.sleep"
+    ) as sleep:
+        with pytest.raises(requests.HTTPError) as excinfo:
+            _put_secret_with_retry(session)
+
+    assert excinfo.value.response is not None
+    assert excinfo.value.response.status_code == 429
+    assert put.call_count == _WRITE_RETRY_ATTEMPTS + 1
+    assert sleep.call_count == _WRITE_RETRY_ATTEMPTS
+
+
+@pytest.mark.parametrize(
+    "response",
+    [_response(422), _response(403, {"X-RateLimit-Remaining": "10"}), _response(500)],
+)
+def test_reraises_non_rate_limit_errors_immediately(response: requests.Response) -> None:
+    """
+    Errors that are not rate limits are raised without retrying.
+    """
+    session = requests.Session()
+    with mock.patch.object(requests.Session, "put", return_value=response) as put, mock.patch(
+        "utils.github_session.time.sleep"
+    ) as sleep:
+        with pytest.raises(requests.HTTPError):
+            _put_secret_with_retry(session)
+
+    assert put.call_count == 1
+    sleep.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "headers, attempt, expected",
+    [
+        ({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, 0, 0.0),
+        ({"Retry-After": "not a date"}, 2, 4.0),
+        ({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "not a number"}, 1, 2.0),
+    ],
+)
+def test_rate_limit_headers_fall_back(headers: Dict[str, str], attempt: int, expected: float) -> None:
+    """
+    A past HTTP date waits 0 seconds, and unparsable headers fall back to the 2**attempt backoff.
+    """
+    status = 403 if "X-RateLimit-Remaining" in headers else 429
+    assert _rate_limit_sleep_seconds(status, headers, attempt) == expected